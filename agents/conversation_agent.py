@@ -6,10 +6,11 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.prompt_values import PromptValue
-from langchain_core.runnables import RunnableLambda, RunnableWithMessageHistory
+from langchain_core.runnables import RunnableConfig, RunnableLambda, RunnableWithMessageHistory
 
 from config import SETTINGS
 from config import llm as model
+from memory.session_cache import session_state_cache
 from memory.short_term import get_session_history
 from utils import PersonaNotFoundException, TemplateLoadException, logger
 
@@ -64,13 +65,24 @@ def load_persona_prompt(persona_name: str, user_name: str = "my friend") -> str:
 # --- Chain Helper Functions ---
 
 
-def add_system_prompt(data: Dict[str, Any]) -> Dict[str, Any]:
+def add_system_prompt(data: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
     """
     Injects the persona-specific system prompt into the runnable input.
+    The rendered prompt is cached per session in the session-state cache.
     """
     persona: str = data.get("persona", "alex")
-    # user_name ileride request'ten gelebilir; şimdilik sabit.
-    data["system_prompt"] = load_persona_prompt(persona_name=persona)
+    session_id = config.get("configurable", {}).get("session_id")
+
+    system_prompt = None
+    if session_id:
+        system_prompt = session_state_cache.get_persona_prompt(session_id, persona)
+    if system_prompt is None:
+        # user_name ileride request'ten gelebilir; şimdilik sabit.
+        system_prompt = load_persona_prompt(persona_name=persona)
+        if session_id:
+            session_state_cache.put_persona_prompt(session_id, persona, system_prompt)
+
+    data["system_prompt"] = system_prompt
     return data
 
 
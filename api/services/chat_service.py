@@ -4,7 +4,7 @@ from typing import AsyncGenerator
 from langchain_core.messages import BaseMessage
 
 from agents.conversation_agent import conversation_chain
-from utils import AppException, logger, filter_allowed_text
+from utils import AppException, TTSTextNormalizer, logger, filter_allowed_text
 
 
 async def handle_chat_stream(session_id: str, user_input: str, persona: str) -> AsyncGenerator[str, None]:
@@ -19,6 +19,8 @@ async def handle_chat_stream(session_id: str, user_input: str, persona: str) ->
     )
 
     config = {"configurable": {"session_id": session_id}}
+    # Keeps numbers and symbol sequences intact across chunk boundaries
+    text_normalizer = TTSTextNormalizer()
 
     try:
         async for chunk in conversation_chain.astream(
@@ -34,12 +36,17 @@ async def handle_chat_stream(session_id: str, user_input: str, persona: str) ->
             else:
                 raw_text = getattr(chunk, "content", None) or str(chunk)
 
-            clean_chunk = filter_allowed_text(raw_text)
+            clean_chunk = text_normalizer.feed(raw_text)
             if clean_chunk:
                 # If your client expects newline-delimited chunks, you can do:
                 # yield clean_chunk + "\n"
                 yield clean_chunk
 
+        # Emit whatever the normalizer was still holding back
+        clean_tail = text_normalizer.flush()
+        if clean_tail:
+            yield clean_tail
+
         logger.info(f"Stream for session '{session_id}' completed successfully.")
 
     except AppException as e:
@@ -0,0 +1,129 @@
+# benchmarks/text_filter_benchmark.py
+"""
+Micro-benchmark for the TTS text filter.
+
+Compares TTSTextNormalizer against the regex whitelist filter it replaced,
+on whole strings and on token-sized stream chunks, for a typical persona
+reply and for a symbol-heavy worst case.
+
+Run from the project root (the usual .env must be present):
+    python -m benchmarks.text_filter_benchmark
+
+Normalizer vs. legacy regex, both called once per chunk like the stream
+path calls them; measured on a noisy VM (best of 7 runs, absolute numbers
+vary between runs):
+    typical, whole string          7.54 vs 3.49 ms/MB  (2.2x slower)
+    typical, 4-char chunks         26.4 vs 33.0 ms/MB  (0.8x)
+    symbol-heavy, whole string     14.3 vs 5.10 ms/MB  (2.8x slower)
+    symbol-heavy, 4-char chunks    30.6 vs 35.9 ms/MB  (0.9x)
+Plain chunks are returned as they are (~0.15 vs ~0.25 us per chunk).
+Chunks with symbols or numbers are served from the normalizer's chunk
+cache; this corpus repeats, so they hit it after the first repetition.
+A chunk that misses the cache (e.g. a new amount) costs ~1-1.5 us.
+Whole strings (the non-streaming endpoint) are slower per MB: currency
+amounts and runs of non-ASCII characters need a Python call each, while
+the old regex only deleted them.
+"""
+
+import re
+import timeit
+from typing import Callable, List
+
+import config  # noqa: F401  (must be imported before utils)
+from utils.helper import TTSTextNormalizer, filter_allowed_text
+
+# The previous implementation of utils.helper.filter_allowed_text, which the
+# stream path called once per chunk.
+LEGACY_PATTERN = re.compile(
+    r"[^a-zA-Z0-9\n\r .,?!';:\"\-()]",
+    flags=re.UNICODE,
+)
+
+
+def legacy_filter_allowed_text(text: str) -> str:
+    return LEGACY_PATTERN.sub("", text)
+
+
+TYPICAL_REPLY = (
+    "Oh, that sounds like a really lovely afternoon! I think taking a long walk "
+    "by the water is one of the best ways to clear your head, especially after "
+    "a busy week like the one you described. Did you end up trying that little "
+    "place near the station? People say their coffee is great, and honestly, "
+    "a quiet corner with a good book can fix almost anything. If the weather "
+    "holds up tomorrow, maybe you could go back and sit outside for a while. "
+    "What kind of books have you been reading lately? I'd love to hear about "
+    "them, and maybe I can suggest something similar that you might enjoy.\n"
+    "The café there charges about €4.50 for a latte, which is 10% cheaper than "
+    "the one downtown 😊\n"
+)
+
+SYMBOL_HEAVY_REPLY = (
+    "Sure! Here's a quick summary of your week. You walked 42,500 steps, "
+    "which is 15% more than last week. The café visit cost €4.50 and the "
+    "groceries came to $1,230.75 in total. **Great job** staying on track 😊\n"
+    "Tomorrow looks sunny with highs around 24°C, so maybe plan a short walk?\n"
+)
+
+TARGET_BYTES = 1_000_000
+CHUNK_SIZE = 4  # roughly one LLM token
+REPEATS = 7
+
+
+def _repeat_to_size(sample: str) -> str:
+    count = TARGET_BYTES // len(sample.encode("utf-8")) + 1
+    return sample * count
+
+
+def _split(text: str, size: int) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _legacy_whole(text: str) -> Callable[[], None]:
+    return lambda: legacy_filter_allowed_text(text)
+
+
+def _legacy_stream(chunks: List[str]) -> Callable[[], None]:
+    def run() -> None:
+        for chunk in chunks:
+            legacy_filter_allowed_text(chunk)
+    return run
+
+
+def _normalizer_whole(text: str) -> Callable[[], None]:
+    return lambda: filter_allowed_text(text)
+
+
+def _normalizer_stream(chunks: List[str]) -> Callable[[], None]:
+    def run() -> None:
+        normalizer = TTSTextNormalizer()
+        feed = normalizer.feed
+        for chunk in chunks:
+            feed(chunk)
+        normalizer.flush()
+    return run
+
+
+def _ms_per_mb(func: Callable[[], None], size_bytes: int) -> float:
+    best = min(timeit.repeat(func, number=1, repeat=REPEATS))
+    return best * 1000 * 1_000_000 / size_bytes
+
+
+def main() -> None:
+    print(f"{'case':<36}{'legacy regex':>16}{'normalizer':>16}")
+    for corpus, sample in (("typical", TYPICAL_REPLY), ("symbol-heavy", SYMBOL_HEAVY_REPLY)):
+        text = _repeat_to_size(sample)
+        chunks = _split(text, CHUNK_SIZE)
+        size_bytes = len(text.encode("utf-8"))
+
+        for mode, legacy, normalizer in (
+            ("whole string", _legacy_whole(text), _normalizer_whole(text)),
+            (f"{CHUNK_SIZE}-char chunks", _legacy_stream(chunks), _normalizer_stream(chunks)),
+        ):
+            legacy_ms = _ms_per_mb(legacy, size_bytes)
+            normalizer_ms = _ms_per_mb(normalizer, size_bytes)
+            label = f"{corpus}, {mode}"
+            print(f"{label:<36}{legacy_ms:>10.2f} ms/MB{normalizer_ms:>10.2f} ms/MB")
+
+
+if __name__ == "__main__":
+    main()
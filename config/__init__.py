@@ -1,4 +1,5 @@
 from .settings import SETTINGS
-from .llm import llm
+from .http_client import http_async_client, http_pool_stats
+from .llm import llm, warm_up_llm
 
-__all__ = ["SETTINGS", "llm"]
+__all__ = ["SETTINGS", "llm", "warm_up_llm", "http_async_client", "http_pool_stats"]
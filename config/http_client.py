@@ -0,0 +1,251 @@
+# config/http_client.py
+"""
+Shared HTTP transport for the LLM provider
+
+This module builds a single, explicitly configured httpx.AsyncClient
+(pool limits, keep-alive expiry, HTTP/2, timeouts) that is reused by the
+ChatOpenAI client, and records connection-pool statistics for it.
+"""
+
+import asyncio
+import importlib.util
+import time
+from typing import Any, Dict, Final, Optional
+
+import httpcore
+import httpx
+
+from config import SETTINGS
+from utils import logger
+
+
+class HTTPPoolStats:
+    """
+    Connection-pool statistics of the shared LLM HTTP client.
+    Collected from httpcore trace events by InstrumentedAsyncTransport;
+    open and idle connections are read from the httpcore pool itself.
+    """
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.http2 = False
+        self.pool: Optional[httpcore.AsyncConnectionPool] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.connections_opened = 0
+        self.pool_wait_seconds_total = 0.0
+        self.pool_wait_seconds_max = 0.0
+        self.connect_seconds_total = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the current statistics as a JSON-serializable dict.
+        Pool utilization is open_connections - idle_connections out of
+        max_connections. concurrency is in-flight requests per allowed
+        connection: with HTTP/1.1 a value above 1.0 means requests are
+        queueing on the pool, while HTTP/2 multiplexes several requests
+        over one connection.
+        """
+        requests_total = max(self.requests_total, 1)
+        connections_opened = max(self.connections_opened, 1)
+        connections = self.pool.connections if self.pool is not None else []
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "concurrency": round(self.in_flight / self.max_connections, 3),
+            "requests_total": self.requests_total,
+            "connections_opened": self.connections_opened,
+            "pool_wait_ms_avg": round(self.pool_wait_seconds_total / requests_total * 1000, 2),
+            "pool_wait_ms_max": round(self.pool_wait_seconds_max * 1000, 2),
+            "connect_ms_avg": round(self.connect_seconds_total / connections_opened * 1000, 2),
+        }
+
+
+class _TrackedResponseStream(httpx.AsyncByteStream):
+    """
+    Response body wrapper that marks the request as finished once the
+    (possibly streamed) body is closed.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, stats: HTTPPoolStats):
+        self._stream = stream
+        self._stats = stats
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._stats.in_flight -= 1
+        await self._stream.aclose()
+
+
+class InstrumentedAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps an httpx transport and records in-flight requests, the time a
+    request waits for a free connection and the time spent opening new
+    connections (TCP + TLS handshake).
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: HTTPPoolStats):
+        self._transport = transport
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._stats
+        queued_at = time.perf_counter()
+        waiting = True
+        connect_started: Optional[float] = None
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            # The pool itself emits no events, so the first event marks the
+            # moment a connection was acquired (or started to be opened).
+            nonlocal waiting, connect_started
+            now = time.perf_counter()
+            if waiting:
+                waiting = False
+                wait_seconds = now - queued_at
+                stats.pool_wait_seconds_total += wait_seconds
+                stats.pool_wait_seconds_max = max(stats.pool_wait_seconds_max, wait_seconds)
+
+            if event_name == "connection.connect_tcp.started":
+                connect_started = now
+                stats.connections_opened += 1
+            elif connect_started is not None and not event_name.startswith("connection."):
+                stats.connect_seconds_total += now - connect_started
+                connect_started = None
+
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        stats.requests_total += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            stats.in_flight -= 1
+            raise
+
+        response.stream = _TrackedResponseStream(response.stream, stats)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_enabled() -> bool:
+    """
+    HTTP/2 needs the optional 'h2' package; fall back to HTTP/1.1 without it.
+    """
+    if not SETTINGS.LLM_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("LLM_HTTP2 is enabled but the 'h2' package is not installed. Using HTTP/1.1.")
+        return False
+    return True
+
+
+# connect/pool timeouts are short so a dead connection fails fast and is
+# retried by the OpenAI SDK (exponential backoff with jitter).
+LLM_TIMEOUT: Final[httpx.Timeout] = httpx.Timeout(
+    SETTINGS.LLM_READ_TIMEOUT_SECONDS,
+    connect=SETTINGS.LLM_CONNECT_TIMEOUT_SECONDS,
+    pool=SETTINGS.LLM_POOL_TIMEOUT_SECONDS,
+)
+
+# The warm-up must not hold up startup for the full read timeout.
+WARMUP_TIMEOUT: Final[httpx.Timeout] = httpx.Timeout(SETTINGS.LLM_CONNECT_TIMEOUT_SECONDS)
+
+
+def build_http_async_client() -> httpx.AsyncClient:
+    """
+    Factory for the shared async HTTP client used by the LLM provider.
+    """
+    http2 = _http2_enabled()
+    limits = httpx.Limits(
+        max_connections=SETTINGS.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=SETTINGS.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=SETTINGS.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    logger.info(
+        f"Initializing LLM HTTP client with http2={http2}, "
+        f"max_connections={limits.max_connections}, "
+        f"max_keepalive_connections={limits.max_keepalive_connections}, "
+        f"keepalive_expiry={limits.keepalive_expiry}s"
+    )
+    transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+    # httpx does not expose the httpcore pool, which knows the open connections
+    http_pool_stats.pool = getattr(transport, "_pool", None)
+    if http_pool_stats.pool is None:
+        logger.warning(
+            "httpx.AsyncHTTPTransport has no '_pool' attribute (httpx version change?). "
+            "open_connections and idle_connections will be reported as 0."
+        )
+    http_pool_stats.http2 = http2
+    return httpx.AsyncClient(
+        transport=InstrumentedAsyncTransport(transport, http_pool_stats),
+        timeout=LLM_TIMEOUT,
+    )
+
+
+async def warm_up_http_pool(base_url: str, api_key: str) -> None:
+    """
+    Pre-opens connections to the provider by sending a few concurrent
+    'GET /models' requests, so the first chat request does not pay for
+    the TCP and TLS handshakes. Failures are logged, not raised.
+    With HTTP/2 concurrent requests share one connection, so a single
+    request is sent; LLM_WARMUP_CONNECTIONS only applies to HTTP/1.1.
+    """
+    connections = SETTINGS.LLM_WARMUP_CONNECTIONS
+    if connections <= 0:
+        return
+    if http_pool_stats.http2:
+        connections = 1
+
+    url = f"{base_url.rstrip('/')}/models"
+    headers = {"Authorization": f"Bearer {api_key}"}
+    started = time.perf_counter()
+
+    results = await asyncio.gather(
+        *(
+            http_async_client.get(url, headers=headers, timeout=WARMUP_TIMEOUT)
+            for _ in range(connections)
+        ),
+        return_exceptions=True,
+    )
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.warning(
+            f"LLM HTTP warm-up: {len(failures)}/{connections} requests to '{url}' failed "
+            f"after {elapsed_ms:.0f} ms. First error: {failures[0]!r}"
+        )
+        return
+
+    statuses = sorted({response.status_code for response in results})
+    message = (
+        f"LLM HTTP warm-up: {connections} requests to '{url}' completed in "
+        f"{elapsed_ms:.0f} ms (status {statuses})."
+    )
+    if statuses[-1] >= 400:
+        logger.warning(message)
+    else:
+        logger.info(message)
+
+
+# Global, shared instances:
+http_pool_stats: Final[HTTPPoolStats] = HTTPPoolStats(max_connections=SETTINGS.LLM_HTTP_MAX_CONNECTIONS)
+http_async_client: Final[httpx.AsyncClient] = build_http_async_client()
@@ -5,6 +5,7 @@ LLM Loader
 This module reads the environment configuration from config.settings,
 selects the correct LLM provider (OpenRouter or Groq),
 and initializes a single 'llm' instance for the application.
+All provider traffic goes through the shared client from config.http_client.
 """
 
 from typing import Final
@@ -12,6 +13,7 @@ from typing import Final
 from langchain_openai import ChatOpenAI
 
 from config import SETTINGS
+from config.http_client import LLM_TIMEOUT, http_async_client, warm_up_http_pool
 from utils import logger
 
 
@@ -35,6 +37,9 @@ def build_chat_openai_client() -> ChatOpenAI:
                 api_key=SETTINGS.OPENROUTER_API_KEY,
                 base_url="https://openrouter.ai/api/v1",
                 streaming=True,
+                http_async_client=http_async_client,
+                timeout=LLM_TIMEOUT,
+                max_retries=SETTINGS.LLM_MAX_RETRIES,
             )
         except Exception as e:
             logger.error("Failed to connect to OpenRouter.", exc_info=True)
@@ -52,6 +57,9 @@ def build_chat_openai_client() -> ChatOpenAI:
                 api_key=SETTINGS.GROQ_API_KEY,
                 base_url="https://api.groq.com/openai/v1",
                 streaming=True,
+                http_async_client=http_async_client,
+                timeout=LLM_TIMEOUT,
+                max_retries=SETTINGS.LLM_MAX_RETRIES,
             )
         except Exception as e:
             logger.error("Failed to connect to Groq.", exc_info=True)
@@ -61,5 +69,16 @@ def build_chat_openai_client() -> ChatOpenAI:
     raise ValueError("Invalid LLM_PROVIDER specified in config.")
 
 
+async def warm_up_llm() -> None:
+    """
+    Pre-opens connections to the configured provider.
+    Called once on server startup, before requests are accepted.
+    """
+    await warm_up_http_pool(
+        base_url=llm.openai_api_base,
+        api_key=llm.openai_api_key.get_secret_value(),
+    )
+
+
 # Global, reusable client instance:
 llm: Final[ChatOpenAI] = build_chat_openai_client()
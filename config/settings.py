@@ -30,12 +30,28 @@ class Settings(BaseSettings):
     OPENROUTER_API_KEY: Optional[str] = None
     GROQ_API_KEY: Optional[str] = None
 
+    # --- LLM HTTP transport (shared connection pool) ---
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 120.0
+    LLM_HTTP2: bool = True  # requires the 'h2' package
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_READ_TIMEOUT_SECONDS: float = 60.0
+    LLM_POOL_TIMEOUT_SECONDS: float = 10.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_WARMUP_CONNECTIONS: int = 2  # HTTP/1.1 only (HTTP/2 opens one), 0 disables the warm-up
+
     # --- Redis (short-term memory) ---
     REDIS_URL: str
     DEFAULT_SESSION_ID: str
     MEMORY_WINDOW_SIZE: int
     REDIS_TTL_SECONDS: int = 1800  # default: 30 minutes
 
+    # --- In-process session-state cache ---
+    # Budget for the serialized size (JSON messages, UTF-8 prompts) of the
+    # cached data, not the size of the Python objects.
+    SESSION_CACHE_MAX_BYTES: int = 33554432  # default: 32 MiB, 0 disables the cache
+
     # --- Logging ---
     LOG_LEVEL: str = "INFO"
 
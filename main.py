@@ -1,14 +1,31 @@
 # main.py
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
 from api.routers import chat_router
+from config import http_async_client, http_pool_stats, warm_up_llm
+from memory import session_state_cache
 from utils import logger
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warms up the LLM provider connections before the server accepts
+    requests, and closes the shared HTTP client on shutdown.
+    """
+    await warm_up_llm()
+    yield
+    await http_async_client.aclose()
+
+
 app = FastAPI(
     title="Conversational AI Agent Server",
     description="A dynamic multi-persona conversational agent server built with FastAPI and LangChain.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(chat_router, prefix="/api")
@@ -22,6 +39,22 @@ async def root():
     return {"status": "ok", "message": "AI Companion server is running."}
 
 
+@app.get("/health/llm-pool", tags=["Health"])
+async def llm_pool():
+    """
+    Open and idle connections, request concurrency and pool wait time of the shared LLM HTTP client.
+    """
+    return http_pool_stats.snapshot()
+
+
+@app.get("/health/session-cache", tags=["Health"])
+async def session_cache():
+    """
+    Hit rate and staleness metrics of the in-process session-state cache.
+    """
+    return session_state_cache.snapshot()
+
+
 if __name__ == "__main__":
     logger.info("AI Companion server is starting up...")
     uvicorn.run(app, host="127.0.0.1", port=8000)
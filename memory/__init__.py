@@ -1,3 +1,4 @@
+from .session_cache import session_state_cache
 from .short_term import get_session_history
 
-__all__ = ["get_session_history"]
+__all__ = ["get_session_history", "session_state_cache"]
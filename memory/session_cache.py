@@ -0,0 +1,275 @@
+# memory/session_cache.py
+"""
+In-process session-state cache
+
+Holds the trimmed history window and the resolved persona prompt of active
+sessions, so a turn does not have to reload them. Entries are evicted in
+LRU order once the cache exceeds its byte budget.
+
+Every cached history carries the Redis version stamp and list length it
+was loaded at. Readers compare both with the current values in Redis (see
+memory.short_term), so a turn written by another worker is never missed,
+even by a worker that appends without bumping the stamp. History without
+a version stamp (a new session, or data written before stamps existed) is
+never cached.
+
+The byte budget is a serialized-size budget: it counts the JSON size of
+the cached messages and the UTF-8 size of the persona prompt, not the
+(larger) size of the Python objects.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+
+from config import SETTINGS
+
+
+class _SessionState:
+    """
+    Cached state of a single session.
+    Sizes are the serialized (JSON) message sizes, used for the byte budget.
+    length is the length of the Redis list, which may be longer than the
+    cached window.
+    """
+
+    __slots__ = (
+        "messages", "message_sizes", "version", "length",
+        "persona", "system_prompt", "prompt_size",
+    )
+
+    def __init__(self):
+        self.messages: Optional[List[BaseMessage]] = None
+        self.message_sizes: List[int] = []
+        self.version: Optional[str] = None
+        self.length = 0
+        self.persona: Optional[str] = None
+        self.system_prompt: Optional[str] = None
+        self.prompt_size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(self.message_sizes) + self.prompt_size
+
+
+class SessionStateCache:
+    """
+    Memory-bounded LRU cache of per-session state.
+    Thread-safe, because chat history is read and written from executor threads.
+    A max_bytes of 0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int, window_size: int):
+        self.max_bytes = max_bytes
+        self.window_size = window_size
+        self.enabled = max_bytes > 0
+        self._entries: "OrderedDict[str, _SessionState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._size_bytes = 0
+
+        # --- Metrics ---
+        self.history_hits = 0
+        self.history_misses = 0
+        self.stale_reloads = 0
+        self.write_conflicts = 0
+        self.prompt_hits = 0
+        self.prompt_misses = 0
+        self.evictions = 0
+
+    # --- History window ---
+
+    def get_history(
+        self,
+        session_id: str,
+        version: Optional[str],
+        length: int,
+    ) -> Optional[List[BaseMessage]]:
+        """
+        Returns the cached history window if it is at the given Redis version
+        and list length, otherwise None (and the caller reloads from Redis).
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            state = self._entries.get(session_id)
+            if version is None or state is None or state.messages is None:
+                self.history_misses += 1
+                return None
+            if state.version != version or state.length != length:
+                # Another worker wrote to this session since we cached it
+                self.history_misses += 1
+                self.stale_reloads += 1
+                return None
+
+            self._entries.move_to_end(session_id)
+            self.history_hits += 1
+            return list(state.messages)
+
+    def put_history(
+        self,
+        session_id: str,
+        messages: List[BaseMessage],
+        message_sizes: List[int],
+        version: Optional[str],
+        length: int,
+    ) -> None:
+        """
+        Stores a history window freshly loaded from Redis at the given
+        version and list length.
+        """
+        if not self.enabled or version is None:
+            return
+
+        with self._lock:
+            state = self._get_or_create(session_id)
+            self._size_bytes -= state.size_bytes
+            state.messages = list(messages)
+            state.message_sizes = list(message_sizes)
+            state.version = version
+            state.length = length
+            self._trim_window(state)
+            self._size_bytes += state.size_bytes
+            self._evict()
+
+    def append_history(
+        self,
+        session_id: str,
+        messages: Sequence[BaseMessage],
+        message_sizes: Sequence[int],
+        previous_version: Optional[str],
+        version: str,
+        length: int,
+    ) -> None:
+        """
+        Write-through after a turn was stored in Redis at the given version,
+        growing the list to the given length. If the cached window is not at
+        the version this write replaced, or the list grew by more than these
+        messages, some other write happened in between, so the cached
+        history is dropped.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            state = self._entries.get(session_id)
+            if state is None or state.messages is None:
+                return
+
+            self._size_bytes -= state.size_bytes
+            if (
+                state.version is not None
+                and state.version == previous_version
+                and state.length + len(messages) == length
+            ):
+                state.messages.extend(messages)
+                state.message_sizes.extend(message_sizes)
+                state.version = version
+                state.length = length
+                self._trim_window(state)
+            else:
+                self.write_conflicts += 1
+                state.messages = None
+                state.message_sizes = []
+            self._size_bytes += state.size_bytes
+            self._entries.move_to_end(session_id)
+            self._evict()
+
+    # --- Persona prompt ---
+
+    def get_persona_prompt(self, session_id: str, persona: str) -> Optional[str]:
+        """
+        Returns the resolved system prompt cached for this session and persona.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            state = self._entries.get(session_id)
+            if state is None or state.persona != persona or state.system_prompt is None:
+                self.prompt_misses += 1
+                return None
+
+            self._entries.move_to_end(session_id)
+            self.prompt_hits += 1
+            return state.system_prompt
+
+    def put_persona_prompt(self, session_id: str, persona: str, system_prompt: str) -> None:
+        """
+        Stores the resolved system prompt for this session and persona.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            state = self._get_or_create(session_id)
+            self._size_bytes -= state.size_bytes
+            state.persona = persona
+            state.system_prompt = system_prompt
+            state.prompt_size = len(system_prompt.encode("utf-8"))
+            self._size_bytes += state.size_bytes
+            self._evict()
+
+    # --- Housekeeping ---
+
+    def invalidate(self, session_id: str) -> None:
+        """
+        Drops everything cached for the session.
+        """
+        with self._lock:
+            state = self._entries.pop(session_id, None)
+            if state is not None:
+                self._size_bytes -= state.size_bytes
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the current cache metrics as a JSON-serializable dict.
+        stale_ratio is the share of history lookups that found an entry
+        outdated by a write from another worker.
+        """
+        with self._lock:
+            lookups = max(self.history_hits + self.history_misses, 1)
+            prompt_lookups = max(self.prompt_hits + self.prompt_misses, 1)
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "history_hits": self.history_hits,
+                "history_misses": self.history_misses,
+                "history_hit_rate": round(self.history_hits / lookups, 3),
+                "stale_reloads": self.stale_reloads,
+                "stale_ratio": round(self.stale_reloads / lookups, 3),
+                "write_conflicts": self.write_conflicts,
+                "prompt_hit_rate": round(self.prompt_hits / prompt_lookups, 3),
+                "evictions": self.evictions,
+            }
+
+    def _get_or_create(self, session_id: str) -> _SessionState:
+        state = self._entries.get(session_id)
+        if state is None:
+            state = _SessionState()
+            self._entries[session_id] = state
+        self._entries.move_to_end(session_id)
+        return state
+
+    def _trim_window(self, state: _SessionState) -> None:
+        # Mirrors trim_history(): a window size of 0 keeps the full history
+        if self.window_size > 0 and len(state.messages) > self.window_size:
+            del state.messages[:-self.window_size]
+            del state.message_sizes[:-self.window_size]
+
+    def _evict(self) -> None:
+        while self._size_bytes > self.max_bytes and self._entries:
+            _, state = self._entries.popitem(last=False)
+            self._size_bytes -= state.size_bytes
+            self.evictions += 1
+
+
+# Global, per-process instance:
+session_state_cache = SessionStateCache(
+    max_bytes=SETTINGS.SESSION_CACHE_MAX_BYTES,
+    window_size=SETTINGS.MEMORY_WINDOW_SIZE,
+)
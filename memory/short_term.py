@@ -1,15 +1,145 @@
 # memory/short_term.py
+import json
+import uuid
+from typing import List, Optional, Sequence
+
 from langchain_community.chat_message_histories import RedisChatMessageHistory
+from langchain_community.utilities.redis import get_client
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
 
 from config import SETTINGS
+from memory.session_cache import SessionStateCache, session_state_cache
+
+# Shared client, so a turn does not open a new connection pool.
+redis_client = get_client(redis_url=SETTINGS.REDIS_URL)
+
+
+class CachedRedisChatMessageHistory(RedisChatMessageHistory):
+    """
+    Redis-backed chat history with a write-through, in-process cache of the
+    trimmed history window. Uses the same storage format as
+    RedisChatMessageHistory, plus a per-session version stamp: a random
+    token that is replaced on every write. Unlike a counter, a token cannot
+    repeat after the keys expire and the session is written again.
+
+    A turn only reads that version stamp and the list length (in one round
+    trip); the history window itself is loaded from Redis only if the cached
+    copy is missing or outdated. The length catches messages appended by
+    workers that still use the plain RedisChatMessageHistory, which does not
+    bump the stamp.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        cache: SessionStateCache,
+        ttl: Optional[int] = None,
+        key_prefix: str = "message_store:",
+        version_key_prefix: str = "message_store_version:",
+    ):
+        # The parent __init__ would create a new Redis client per session,
+        # so the attributes it relies on are set here instead.
+        self.redis_client = redis_client
+        self.session_id = session_id
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.version_key_prefix = version_key_prefix
+        self.cache = cache
+
+    @property
+    def version_key(self) -> str:
+        return self.version_key_prefix + self.session_id
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        """
+        Returns the last window of messages, from the cache when it is
+        up to date and from Redis otherwise.
+        """
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.get(self.version_key)
+        pipe.llen(self.key)
+        version, length = pipe.execute()
+        cached = self.cache.get_history(self.session_id, _decode(version), length)
+        if cached is not None:
+            return cached
+
+        # Read the window, its version and the list length atomically
+        window_end = self.cache.window_size - 1 if self.cache.window_size > 0 else -1
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.lrange(self.key, 0, window_end)
+        pipe.get(self.version_key)
+        pipe.llen(self.key)
+        items, version, length = pipe.execute()
+
+        items = items[::-1]
+        messages = messages_from_dict([json.loads(m.decode("utf-8")) for m in items])
+        self.cache.put_history(
+            self.session_id,
+            messages,
+            message_sizes=[len(m) for m in items],
+            version=_decode(version),
+            length=length,
+        )
+        return messages
+
+    @messages.setter
+    def messages(self, messages: List[BaseMessage]) -> None:
+        raise NotImplementedError(
+            "Direct assignment to 'messages' is not allowed."
+            " Use the 'add_messages' instead."
+        )
+
+    def add_message(self, message: BaseMessage) -> None:
+        """Append the message to the record in Redis"""
+        self.add_messages([message])
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        """
+        Appends the messages to Redis, bumps the version stamp and
+        writes the turn through to the cache.
+        """
+        if not messages:
+            return
+
+        payloads = [json.dumps(message_to_dict(m)) for m in messages]
+        version = uuid.uuid4().hex
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.lpush(self.key, *payloads)
+        # Swaps in the new stamp and returns the one it replaced
+        pipe.set(self.version_key, version, ex=self.ttl or None, get=True)
+        if self.ttl:
+            pipe.expire(self.key, self.ttl)
+        length, previous_version, *_ = pipe.execute()
+
+        self.cache.append_history(
+            self.session_id,
+            messages,
+            message_sizes=[len(p.encode("utf-8")) for p in payloads],
+            previous_version=_decode(previous_version),
+            version=version,
+            length=length,
+        )
+
+    def clear(self) -> None:
+        """Clear session memory from Redis and from the cache"""
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.delete(self.key)
+        pipe.delete(self.version_key)
+        pipe.execute()
+        self.cache.invalidate(self.session_id)
+
+
+def _decode(value: Optional[bytes]) -> Optional[str]:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
 
 
-def get_session_history(session_id: str) -> RedisChatMessageHistory:
+def get_session_history(session_id: str) -> CachedRedisChatMessageHistory:
     """
-    Returns a Redis-backed chat history object for the given session_id.
+    Returns a Redis-backed, cached chat history object for the given session_id.
     """
-    return RedisChatMessageHistory(
+    return CachedRedisChatMessageHistory(
         session_id=session_id,
-        url=SETTINGS.REDIS_URL,
+        cache=session_state_cache,
         ttl=SETTINGS.REDIS_TTL_SECONDS,
     )
@@ -0,0 +1,18 @@
+# tests/conftest.py
+"""
+Test configuration. The settings are loaded from the environment (or .env)
+when config is imported, so the required values get test defaults here.
+"""
+
+import os
+
+os.environ.setdefault("LLM_PROVIDER", "groq")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ.setdefault("LLM_MODEL", "test-model")
+os.environ.setdefault("LLM_HTTP2", "false")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("DEFAULT_SESSION_ID", "default_session")
+os.environ.setdefault("MEMORY_WINDOW_SIZE", "16")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import config  # noqa: E402,F401  (must be imported before utils)
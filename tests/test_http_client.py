@@ -0,0 +1,100 @@
+# tests/test_http_client.py
+import asyncio
+
+import httpx
+
+from config import http_client
+from config.http_client import HTTPPoolStats, InstrumentedAsyncTransport
+
+
+class _Connection:
+    def __init__(self, idle: bool):
+        self._idle = idle
+
+    def is_idle(self) -> bool:
+        return self._idle
+
+
+class _Pool:
+    def __init__(self, *idle):
+        self.connections = [_Connection(value) for value in idle]
+
+
+class _Body(httpx.AsyncByteStream):
+    """
+    A streamed body, unlike the preloaded content of httpx.Response(text=...).
+    """
+
+    async def __aiter__(self):
+        yield b"ok"
+
+
+def test_snapshot_reports_open_and_idle_connections():
+    stats = HTTPPoolStats(max_connections=4)
+    stats.pool = _Pool(True, False, False)
+    stats.in_flight = 6
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["open_connections"] == 3
+    assert snapshot["idle_connections"] == 1
+    assert snapshot["concurrency"] == 1.5
+    assert "utilization" not in snapshot
+
+
+def test_snapshot_without_pool():
+    snapshot = HTTPPoolStats(max_connections=4).snapshot()
+
+    assert snapshot["open_connections"] == 0
+    assert snapshot["idle_connections"] == 0
+
+
+def test_in_flight_counts_until_the_body_is_closed():
+    stats = HTTPPoolStats(max_connections=4)
+    transport = InstrumentedAsyncTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200, stream=_Body())), stats
+    )
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "http://test/models") as response:
+                assert stats.in_flight == 1
+                await response.aread()
+            assert stats.in_flight == 0
+
+    asyncio.run(run())
+    assert stats.requests_total == 1
+    assert stats.peak_in_flight == 1
+
+
+def test_warm_up_uses_a_short_timeout(monkeypatch):
+    timeouts = []
+
+    async def get(url, headers, timeout):
+        timeouts.append(timeout)
+        return httpx.Response(200)
+
+    monkeypatch.setattr(http_client.SETTINGS, "LLM_WARMUP_CONNECTIONS", 2)
+    monkeypatch.setattr(http_client.http_pool_stats, "http2", False)
+    monkeypatch.setattr(http_client.http_async_client, "get", get)
+
+    asyncio.run(http_client.warm_up_http_pool("http://test/v1", "key"))
+
+    assert timeouts == [http_client.WARMUP_TIMEOUT] * 2
+    assert http_client.WARMUP_TIMEOUT.read < http_client.LLM_TIMEOUT.read
+
+
+def test_warm_up_sends_one_request_with_http2(monkeypatch):
+    urls = []
+
+    async def get(url, headers, timeout):
+        urls.append(url)
+        return httpx.Response(200)
+
+    monkeypatch.setattr(http_client.SETTINGS, "LLM_WARMUP_CONNECTIONS", 2)
+    monkeypatch.setattr(http_client.http_pool_stats, "http2", True)
+    monkeypatch.setattr(http_client.http_async_client, "get", get)
+
+    asyncio.run(http_client.warm_up_http_pool("http://test/v1", "key"))
+
+    assert urls == ["http://test/v1/models"]
@@ -0,0 +1,235 @@
+# tests/test_session_cache.py
+import json
+
+import fakeredis
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, message_to_dict
+
+from memory.session_cache import SessionStateCache
+from memory.short_term import CachedRedisChatMessageHistory
+
+
+def _messages(*contents):
+    return [HumanMessage(content=content) for content in contents]
+
+
+def _contents(messages):
+    return [message.content for message in messages]
+
+
+# --- SessionStateCache ---
+
+
+def test_history_is_served_only_at_the_same_version_and_length():
+    cache = SessionStateCache(max_bytes=10_000, window_size=16)
+    cache.put_history("s", _messages("a", "b"), [10, 10], version="v1", length=2)
+
+    assert _contents(cache.get_history("s", "v1", 2)) == ["a", "b"]
+    assert cache.get_history("s", "v2", 2) is None
+    assert cache.get_history("s", "v1", 3) is None
+    assert cache.history_hits == 1
+    assert cache.stale_reloads == 2
+
+
+def test_history_without_version_is_not_cached():
+    cache = SessionStateCache(max_bytes=10_000, window_size=16)
+    cache.put_history("s", _messages("a"), [10], version=None, length=1)
+
+    assert cache.get_history("s", None, 1) is None
+    assert cache.snapshot()["entries"] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = SessionStateCache(max_bytes=0, window_size=16)
+    cache.put_history("s", _messages("a"), [10], version="v1", length=1)
+
+    assert cache.get_history("s", "v1", 1) is None
+
+
+def test_append_extends_the_window_when_nothing_happened_in_between():
+    cache = SessionStateCache(max_bytes=10_000, window_size=16)
+    cache.put_history("s", _messages("a"), [10], version="v1", length=1)
+    cache.append_history("s", _messages("b", "c"), [10, 10], previous_version="v1", version="v2", length=3)
+
+    assert _contents(cache.get_history("s", "v2", 3)) == ["a", "b", "c"]
+    assert cache.write_conflicts == 0
+    assert cache.snapshot()["size_bytes"] == 30
+
+
+def test_append_after_another_versioned_write_drops_the_history():
+    cache = SessionStateCache(max_bytes=10_000, window_size=16)
+    cache.put_history("s", _messages("a"), [10], version="v1", length=1)
+    # Another worker wrote "v2" before this write replaced it
+    cache.append_history("s", _messages("c"), [10], previous_version="v2", version="v3", length=3)
+
+    assert cache.get_history("s", "v3", 3) is None
+    assert cache.write_conflicts == 1
+    assert cache.snapshot()["size_bytes"] == 0
+
+
+def test_append_after_an_unversioned_write_drops_the_history():
+    cache = SessionStateCache(max_bytes=10_000, window_size=16)
+    cache.put_history("s", _messages("a"), [10], version="v1", length=1)
+    # A legacy writer pushed one message without bumping the stamp
+    cache.append_history("s", _messages("c"), [10], previous_version="v1", version="v2", length=3)
+
+    assert cache.get_history("s", "v2", 3) is None
+    assert cache.write_conflicts == 1
+
+
+def test_append_without_cached_history_is_ignored():
+    cache = SessionStateCache(max_bytes=10_000, window_size=16)
+    cache.append_history("s", _messages("a"), [10], previous_version=None, version="v1", length=1)
+
+    assert cache.get_history("s", "v1", 1) is None
+    assert cache.write_conflicts == 0
+
+
+def test_window_is_trimmed_to_the_window_size():
+    cache = SessionStateCache(max_bytes=10_000, window_size=3)
+    cache.put_history("s", _messages("a", "b", "c", "d"), [1, 2, 3, 4], version="v1", length=4)
+    assert _contents(cache.get_history("s", "v1", 4)) == ["b", "c", "d"]
+
+    cache.append_history("s", _messages("e", "f"), [5, 6], previous_version="v1", version="v2", length=6)
+    assert _contents(cache.get_history("s", "v2", 6)) == ["d", "e", "f"]
+    assert cache.snapshot()["size_bytes"] == 4 + 5 + 6
+
+
+def test_window_size_zero_keeps_the_full_history():
+    cache = SessionStateCache(max_bytes=10_000, window_size=0)
+    cache.put_history("s", _messages(*"abcdefgh"), [1] * 8, version="v1", length=8)
+
+    assert len(cache.get_history("s", "v1", 8)) == 8
+
+
+def test_least_recently_used_sessions_are_evicted_by_bytes():
+    cache = SessionStateCache(max_bytes=100, window_size=16)
+    cache.put_history("a", _messages("a"), [40], version="v1", length=1)
+    cache.put_history("b", _messages("b"), [40], version="v1", length=1)
+    # Touch "a", so "b" is the least recently used one
+    assert cache.get_history("a", "v1", 1) is not None
+
+    cache.put_history("c", _messages("c"), [40], version="v1", length=1)
+
+    assert cache.get_history("b", "v1", 1) is None
+    assert cache.get_history("a", "v1", 1) is not None
+    assert cache.get_history("c", "v1", 1) is not None
+    assert cache.evictions == 1
+    assert cache.snapshot()["size_bytes"] == 80
+
+
+def test_persona_prompt_counts_its_utf8_size():
+    cache = SessionStateCache(max_bytes=10_000, window_size=16)
+    cache.put_persona_prompt("s", "miki", "ü" * 10)
+
+    assert cache.get_persona_prompt("s", "miki") == "ü" * 10
+    assert cache.get_persona_prompt("s", "alex") is None
+    assert cache.snapshot()["size_bytes"] == 20
+
+
+def test_invalidate_releases_the_budget():
+    cache = SessionStateCache(max_bytes=10_000, window_size=16)
+    cache.put_history("s", _messages("a"), [10], version="v1", length=1)
+    cache.put_persona_prompt("s", "miki", "prompt")
+    cache.invalidate("s")
+
+    assert cache.snapshot()["size_bytes"] == 0
+    assert cache.get_history("s", "v1", 1) is None
+
+
+# --- CachedRedisChatMessageHistory ---
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _worker(server, window_size=16):
+    """
+    One worker process: its own cache and Redis connection to the shared server.
+    """
+    cache = SessionStateCache(max_bytes=1_000_000, window_size=window_size)
+    history = CachedRedisChatMessageHistory("s", cache=cache, ttl=1800)
+    history.redis_client = fakeredis.FakeRedis(server=server)
+    return history
+
+
+def test_add_messages_bumps_the_stamp_and_writes_through(server):
+    history = _worker(server)
+    assert history.messages == []
+
+    history.add_messages([HumanMessage(content="hi")])
+    first_version = history.redis_client.get(history.version_key)
+    assert _contents(history.messages) == ["hi"]
+    history.add_messages([AIMessage(content="hello")])
+    second_version = history.redis_client.get(history.version_key)
+
+    assert first_version and second_version and first_version != second_version
+    assert 0 < history.redis_client.ttl(history.version_key) <= 1800
+    assert _contents(history.messages) == ["hi", "hello"]
+    # Served from the write-through copy, not reloaded
+    hits = history.cache.history_hits
+    assert _contents(history.messages) == ["hi", "hello"]
+    assert history.cache.history_hits == hits + 1
+    assert history.cache.write_conflicts == 0
+
+
+def test_reload_is_trimmed_to_the_window(server):
+    history = _worker(server, window_size=2)
+    history.add_messages(_messages("a", "b", "c"))
+
+    assert _contents(history.messages) == ["b", "c"]
+    history.add_messages(_messages("d"))
+    assert _contents(history.messages) == ["c", "d"]
+    assert history.cache.stale_reloads == 0
+
+
+def test_write_from_another_worker_is_seen(server):
+    worker_a, worker_b = _worker(server), _worker(server)
+    worker_a.add_messages(_messages("a"))
+    assert _contents(worker_a.messages) == ["a"]
+    assert _contents(worker_b.messages) == ["a"]
+
+    worker_b.add_messages(_messages("b"))
+
+    assert _contents(worker_a.messages) == ["a", "b"]
+    assert worker_a.cache.stale_reloads == 1
+
+
+def test_write_between_read_and_write_of_another_worker(server):
+    worker_a, worker_b = _worker(server), _worker(server)
+    worker_a.add_messages(_messages("a"))
+    assert _contents(worker_a.messages) == ["a"]
+
+    # Worker B writes between worker A's read and write
+    worker_b.add_messages(_messages("b"))
+    worker_a.add_messages(_messages("c"))
+
+    assert worker_a.cache.write_conflicts == 1
+    assert _contents(worker_a.messages) == ["a", "b", "c"]
+    assert _contents(worker_b.messages) == ["a", "b", "c"]
+
+
+def test_write_from_a_worker_without_version_stamps_is_seen(server):
+    history = _worker(server)
+    history.add_messages(_messages("a"))
+    assert _contents(history.messages) == ["a"]
+
+    # Plain RedisChatMessageHistory: LPUSH without touching the stamp
+    history.redis_client.lpush(history.key, json.dumps(message_to_dict(HumanMessage(content="b"))))
+
+    assert _contents(history.messages) == ["a", "b"]
+    history.add_messages(_messages("c"))
+    assert _contents(history.messages) == ["a", "b", "c"]
+
+
+def test_clear_removes_history_and_cache(server):
+    history = _worker(server)
+    history.add_messages(_messages("a"))
+    assert _contents(history.messages) == ["a"]
+
+    history.clear()
+
+    assert history.messages == []
+    assert history.redis_client.exists(history.key, history.version_key) == 0
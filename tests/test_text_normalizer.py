@@ -0,0 +1,128 @@
+# tests/test_text_normalizer.py
+import pytest
+
+from utils.helper import TTSTextNormalizer, filter_allowed_text
+
+
+def _stream(chunks):
+    normalizer = TTSTextNormalizer()
+    return "".join(normalizer.feed(chunk) for chunk in chunks) + normalizer.flush()
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Hello, world!", "Hello, world!"),
+        ("café", "cafe"),
+        ("Crème brûlée", "Creme brulee"),
+        # Spoken words are padded with spaces on both sides
+        ("5% more", "5 percent  more"),
+        ("$1,200.50 total", " 1200.50 dollars  total"),
+        ("only 5€", "only 5 euros "),
+        ("£20 and ¥300", " 20 pounds  and  300 yen "),
+        ("1,000,000 people", "1000000 people"),
+        ("walked 42,500 steps", "walked 42500 steps"),
+        ("x&y", "x and y"),
+        ("24°C, sunny", "24 degrees C, sunny"),
+        ("email@host.com", "email at host.com"),
+        ("word—word", "word - word"),
+        ("and/or", "and or"),
+        ("3/4 cup", "3 slash 4 cup"),
+        ("on 10/19/2026", "on 10 slash 19 slash 2026"),
+        ("**bold** text", "bold text"),
+        ("word 😊 next", "word  next"),
+        ("😊 Hello", " Hello"),
+        ("中文 ok", " ok"),
+    ],
+)
+def test_mappings(text, expected):
+    assert filter_allowed_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        # A space between the symbol and the amount is allowed
+        ("€ 5", " 5 euros "),
+        # Magnitudes and scale words belong to the amount
+        ("€5m", " 5 million euros "),
+        ("$2bn deal", " 2 billion dollars  deal"),
+        ("€5 million.", " 5 million euros ."),
+        # ...but only as whole words
+        ("$5 millions", " 5 dollars  millions"),
+        ("$5mph", " 5 dollars mph"),
+        # An amount without a leading digit
+        ("$.50", " 0.50 dollars "),
+        # A symbol without an amount
+        ("in €", "in  euros "),
+        # Non-ASCII characters right before the symbol
+        ("😊€1,100", " 1100 euros "),
+        # ...or between the symbol and the amount
+        ("$😊22", " dollars 22"),
+        # A symbol right before another amount
+        ("$€37k", " dollars  37 thousand euros "),
+    ],
+)
+def test_currency_edge_cases(text, expected):
+    assert filter_allowed_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Not thousands separators
+        "1,2345",
+        "1,23",
+        "pick 1,2 or 3",
+    ],
+)
+def test_commas_that_are_not_thousands_separators_are_kept(text):
+    assert filter_allowed_text(text) == text
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "The café charges about €4.50 for a latte, 10% cheaper 😊\nOK?",
+        "You walked 42,500 steps and spent $1,230.75 (**great**) at 24°C.",
+        "Prices: € 5, €5m, $.50, £1,000,000 and 5€ — or 1,2345?",
+        "naïve façade: x&y, and/or 50%% 👩‍👩‍👧 done",
+        "Due 10/19/2026, 3/4 paid: $1,230.75, €5 million.",
+        "£3.5/4 and £3/0😊96, 3/😊4 or $€37k",
+    ],
+)
+def test_stream_matches_whole_text_at_every_split_point(text):
+    expected = filter_allowed_text(text)
+    for split in range(len(text) + 1):
+        assert _stream([text[:split], text[split:]]) == expected, split
+
+
+def test_stream_matches_whole_text_in_token_sized_chunks():
+    text = "Sure! It costs $1,230.75, about €1,100 or 15% more 😊 than café prices."
+    expected = filter_allowed_text(text)
+    for size in range(1, 8):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert _stream(chunks) == expected, size
+
+
+def test_empty_chunks_are_ignored():
+    assert _stream(["", "5", "", "%", ""]) == "5 percent "
+
+
+@pytest.mark.parametrize("char", ["中", "😊", "́"])
+def test_unspeakable_runs_are_not_held_back(char):
+    normalizer = TTSTextNormalizer()
+    for _ in range(1000):
+        assert normalizer.feed(char * 4 + " ok") == " ok"
+    assert normalizer.flush() == ""
+
+
+def test_long_amounts_are_emitted_in_pieces():
+    normalizer = TTSTextNormalizer()
+    normalizer.feed("$")
+    emitted = 0
+    for count in range(1, 1001):
+        emitted += normalizer.feed("5555").count("5")
+        # At most 32 characters are held back
+        assert emitted >= 4 * count - 32
+    assert emitted + normalizer.flush().count("5") == 4000
@@ -1,10 +1,11 @@
 from .logging import logger
-from .helper import filter_allowed_text
+from .helper import TTSTextNormalizer, filter_allowed_text
 from .exceptions import AppException, PersonaNotFoundException, TemplateLoadException
 
 __all__ = [
     "logger",
     "filter_allowed_text",
+    "TTSTextNormalizer",
     "AppException",
     "PersonaNotFoundException",
     "TemplateLoadException",
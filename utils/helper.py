@@ -1,24 +1,10 @@
 # utils/helper.py
-import re
-
-# This regex pattern matches any character that is NOT (^)
-# in the allowed set:
-# - a-z, A-Z (letters)
-# - 0-9 (numbers)
-# - \n, \r (newlines)
-# - a space ' '
-# - the punctuation marks .,?!';:"-()
-# This guarantees that only safe, speakable ASCII characters are left.
-ALLOWED_CHARS_PATTERN = re.compile(
-    r"[^a-zA-Z0-9\n\r .,?!';:\"\-()]",
-    flags=re.UNICODE,
-)
+from .tts_normalizer import TTSTextNormalizer, normalize_text  # noqa: F401
 
 
 def filter_allowed_text(text: str) -> str:
     """
-    Strips all characters from a string except for a whitelist of
-    English alphabet, numbers, newlines, and common punctuation.
-    Intended for Text-to-Speech friendly output.
+    Normalizes a complete string for Text-to-Speech output
+    (see utils/tts_normalizer.py). Use TTSTextNormalizer for streamed chunks.
     """
-    return ALLOWED_CHARS_PATTERN.sub("", text)
+    return normalize_text(text)
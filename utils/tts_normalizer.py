@@ -0,0 +1,341 @@
+# utils/tts_normalizer.py
+"""
+Text-to-Speech normalization of LLM output.
+
+Accented letters are transliterated (é -> e), symbols and currency amounts
+are spelled out (5% -> 5 percent, $1,200 -> 1200 dollars), thousands
+separators are removed and everything else that cannot be spoken (emojis,
+markdown, control characters) is dropped.
+
+The work is done by a few passes over the whole text that run in C:
+numbers and currency amounts are handled by regular expressions first,
+then non-ASCII characters are replaced by an encode error handler, which
+only calls into Python once per run of such characters, and the remaining
+ASCII symbols are handled by str.translate and str.replace.
+"""
+
+import codecs
+import re
+import string
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Characters that are passed through unchanged.
+# This guarantees that only safe, speakable ASCII characters are left.
+ALLOWED_CHARS = (
+    "abcdefghijklmnopqrstuvwxyz"
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "0123456789"
+    "\n\r .,?!';:\"-()"
+)
+
+# Currency symbols are spoken after the amount: "$5" -> "5 dollars".
+CURRENCY_WORDS: Dict[str, str] = {
+    "$": "dollars",
+    "€": "euros",
+    "£": "pounds",
+    "¥": "yen",
+    "₺": "lira",
+    "¢": "cents",
+}
+
+# Magnitudes that may follow a currency amount: "$5m" / "$5 million".
+SCALE_WORDS: Dict[str, str] = {
+    "k": "thousand",
+    "m": "million",
+    "b": "billion",
+    "bn": "billion",
+    "thousand": "thousand",
+    "million": "million",
+    "billion": "billion",
+    "trillion": "trillion",
+}
+
+# Symbols that are spoken instead of being dropped. Spoken words are always
+# padded with a space on both sides, so a symbol next to a space leaves a
+# double space; TTS engines read it as a single pause.
+SYMBOL_WORDS: Dict[str, str] = {
+    "%": " percent ",
+    "‰": " per mille ",
+    "°": " degrees ",
+    "&": " and ",
+    "+": " plus ",
+    "=": " equals ",
+    "@": " at ",
+    "×": " times ",
+    "÷": " divided by ",
+    "±": " plus or minus ",
+    "½": " one half ",
+    "⅓": " one third ",
+    "¼": " one quarter ",
+    "¾": " three quarters ",
+    "—": " - ",
+    # "3/4" and "10/19/2026" are read with "slash" (DIGIT_SLASH_PATTERN);
+    # between words ("and/or") the slash only separates them.
+    "/": " ",
+    "\t": " ",
+}
+
+# Letters and punctuation that have no ASCII decomposition in Unicode.
+TRANSLITERATIONS: Dict[str, str] = {
+    "ı": "i",
+    "ß": "ss",
+    "æ": "ae",
+    "Æ": "AE",
+    "œ": "oe",
+    "Œ": "OE",
+    "ø": "o",
+    "Ø": "O",
+    "đ": "d",
+    "Đ": "D",
+    "ł": "l",
+    "Ł": "L",
+    "þ": "th",
+    "Þ": "Th",
+    "ð": "d",
+    "Ð": "D",
+    "‘": "'",
+    "’": "'",
+    "‚": "'",
+    "‛": "'",
+    "“": '"',
+    "”": '"',
+    "„": '"',
+    "«": '"',
+    "»": '"',
+    "‐": "-",
+    "‑": "-",
+    "‒": "-",
+    "–": "-",
+}
+
+
+def _resolve_char(char: str) -> str:
+    """
+    Returns the speakable replacement for a single character,
+    or an empty string if it should be dropped.
+    """
+    if char in ALLOWED_CHARS:
+        return char
+    if char in SYMBOL_WORDS:
+        return SYMBOL_WORDS[char]
+    if char in CURRENCY_WORDS:
+        return f" {CURRENCY_WORDS[char]} "
+    if char in TRANSLITERATIONS:
+        return TRANSLITERATIONS[char]
+    if unicodedata.category(char) == "Zs":
+        return " "
+
+    # Compatibility decomposition splits "é" into "e" + combining accent and
+    # "…" into "...". Combining marks are dropped, the rest must be allowed.
+    decomposed = "".join(
+        c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c)
+    )
+    if decomposed and all(c in ALLOWED_CHARS for c in decomposed):
+        return decomposed
+    return ""
+
+
+class _TranslationTable(dict):
+    """
+    str.translate() mapping that resolves code points on first sight.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        replacement = _resolve_char(chr(codepoint))
+        self[codepoint] = replacement
+        return replacement
+
+
+TRANSLATION_TABLE = _TranslationTable()
+
+# "1,000,000" -> "1000000", which TTS engines read as a single number.
+# The pattern starts with the comma, so the regex engine can skip to the
+# next comma instead of trying every position.
+THOUSANDS_SEPARATOR_PATTERN = re.compile(r",(?<=[0-9],)(?=[0-9]{3}(?![0-9]))")
+
+# "3/4" -> "3 slash 4", "10/19/2026" -> "10 slash 19 slash 2026".
+DIGIT_SLASH_PATTERN = re.compile(r"/(?<=[0-9]/)(?=[0-9])")
+
+# A currency symbol with an optional amount and magnitude, spoken as
+# "<amount> [<magnitude>] <currency>": "€ 5" -> "5 euros",
+# "$.50" -> "0.50 dollars", "€5m" -> "5 million euros".
+CURRENCY_AMOUNT_PATTERN = re.compile(
+    rf"[{re.escape(''.join(CURRENCY_WORDS))}]"
+    r"(?: ?(?P<amount>[0-9]+(?:\.[0-9]+)?|\.[0-9]+)"
+    r"(?:(?P<suffix>bn|BN|[kKmMbB])(?![A-Za-z])"
+    r"| (?P<scale>(?i:thousand|million|billion|trillion))(?![A-Za-z]))?)?"
+)
+
+# ASCII characters that are not allowed, except "$" (see above): those that
+# become one character or nothing are handled by one str.translate() call,
+# the others are replaced one by one.
+_ASCII_REPLACEMENTS = {
+    char: _resolve_char(char)
+    for char in map(chr, range(128))
+    if char not in ALLOWED_CHARS and char not in CURRENCY_WORDS
+}
+_ASCII_TABLE = str.maketrans(
+    {char: replacement or None for char, replacement in _ASCII_REPLACEMENTS.items()
+     if len(replacement) <= 1}
+)
+_ASCII_WORDS = {
+    char: replacement for char, replacement in _ASCII_REPLACEMENTS.items() if len(replacement) > 1
+}
+# Deletes the allowed characters, which leaves the ones that need work.
+_ALLOWED_TABLE = str.maketrans(dict.fromkeys(ALLOWED_CHARS))
+
+_ERROR_HANDLER = "tts_normalizer"
+
+
+def _speak_currency(match: "re.Match[str]") -> str:
+    """
+    Returns the spoken form of a CURRENCY_AMOUNT_PATTERN match.
+    """
+    return _speak_amount(match.group())
+
+
+@lru_cache(maxsize=1024)
+def _speak_amount(unit: str) -> str:
+    """
+    Returns the spoken form of a currency symbol with its amount.
+    """
+    match = CURRENCY_AMOUNT_PATTERN.fullmatch(unit)
+    words = []
+    amount = match["amount"]
+    if amount:
+        words.append("0" + amount if amount[0] == "." else amount)
+    magnitude = match["suffix"] or match["scale"]
+    if magnitude:
+        words.append(SCALE_WORDS[magnitude.lower()])
+    words.append(CURRENCY_WORDS[unit[0]])
+    return f" {' '.join(words)} "
+
+
+@lru_cache(maxsize=4096)
+def _replace_run(run: str) -> str:
+    """
+    Returns the replacement for a run of non-ASCII characters.
+    """
+    return run.translate(TRANSLATION_TABLE)
+
+
+def _replace_non_ascii(error: UnicodeEncodeError) -> Tuple[str, int]:
+    """
+    Encode error handler that replaces non-ASCII characters.
+    """
+    return _replace_run(error.object[error.start:error.end]), error.end
+
+
+codecs.register_error(_ERROR_HANDLER, _replace_non_ascii)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes a complete text for Text-to-Speech output.
+    Use TTSTextNormalizer for streamed chunks.
+    """
+    if "," in text:
+        text = THOUSANDS_SEPARATOR_PATTERN.sub("", text)
+    # Amounts and slashes are read before anything is dropped, so that
+    # "$😊5" is not read as "$5", just like in a stream.
+    if any(symbol in text for symbol in CURRENCY_WORDS):
+        text = CURRENCY_AMOUNT_PATTERN.sub(_speak_currency, text)
+    if "/" in text:
+        text = DIGIT_SLASH_PATTERN.sub(" slash ", text)
+    if not text.isascii():
+        text = text.encode("ascii", _ERROR_HANDLER).decode("ascii")
+
+    specials = text.translate(_ALLOWED_TABLE)
+    if not specials:
+        return text
+    text = text.translate(_ASCII_TABLE)
+    for char in _ASCII_WORDS.keys() & set(specials):
+        text = text.replace(char, _ASCII_WORDS[char])
+    return text
+
+
+# The end of a text that may still change with the text that follows:
+# a currency symbol with an unfinished amount or magnitude, or a number
+# that may go on with digits, a thousands separator or a slash. At most
+# _PENDING_LENGTH characters are held back, so longer numbers and amounts
+# are emitted in pieces.
+_CURRENCY_TAIL_PATTERN = re.compile(
+    rf"[{re.escape(''.join(CURRENCY_WORDS))}] ?"
+    r"(?:(?:[0-9][0-9,]*(?:\.[0-9,]*)?|\.[0-9,]*)(?:[A-Za-z]{0,2}| [A-Za-z]{0,8})?)?\Z"
+)
+_CURRENCY_TAIL_CHARS = " 0123456789.,"
+_NUMBER_TAIL_CHARS = "0123456789,/"
+_PENDING_LENGTH = 32
+
+# Chunks made only of these characters are emitted unchanged. Digits are
+# excluded, because a number may continue in the next chunk.
+_PLAIN_CHARS = ALLOWED_CHARS.translate(str.maketrans("", "", string.digits))
+
+
+def _pending_tail_start(text: str) -> int:
+    """
+    Returns where the part of the text that may continue in the next
+    chunk starts, or len(text) if all of it can be emitted.
+    """
+    limit = max(len(text) - _PENDING_LENGTH, 0)
+    start = len(text.rstrip(string.ascii_letters).rstrip(_CURRENCY_TAIL_CHARS)) - 1
+    if start >= limit and text[start] in CURRENCY_WORDS and _CURRENCY_TAIL_PATTERN.match(text, start):
+        return start
+    start = len(text.rstrip(_NUMBER_TAIL_CHARS))
+    # A number that goes on from a currency amount ("£3.5/4") is held
+    # back together with it.
+    symbol = len(text[:start].rstrip(_CURRENCY_TAIL_CHARS)) - 1
+    if start < len(text) and symbol >= limit and text[symbol] in CURRENCY_WORDS:
+        return symbol
+    while start < len(text) and text[start] in ",/":
+        start += 1
+    return max(start, limit)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_chunk(text: str) -> Tuple[str, str]:
+    """
+    Normalizes the part of a chunk (with the held back text in front of it)
+    that cannot change anymore. Returns it and the text to hold back.
+    """
+    start = _pending_tail_start(text)
+    return normalize_text(text[:start]), text[start:]
+
+
+class TTSTextNormalizer:
+    """
+    Converts streamed LLM output into Text-to-Speech friendly text.
+
+    Every replacement depends only on the character itself, except for
+    numbers and currency amounts: the end of a chunk that may continue in
+    the next one (see _pending_tail_start) is held back. Streaming therefore
+    produces the same text as normalize_text() on the whole response, as
+    long as no number or currency amount is longer than 32 characters;
+    longer ones are emitted in pieces.
+
+    Plain chunks are returned as they are; the others are normalized
+    through a small cache, since a token stream repeats the same symbols,
+    emojis and number tokens. One instance must be used per stream.
+    """
+
+    def __init__(self) -> None:
+        self._carry = ""
+
+    def feed(self, chunk: str) -> str:
+        """
+        Normalizes the next chunk of the stream.
+        May return an empty string while a number is being held back.
+        """
+        if not self._carry and not chunk.strip(_PLAIN_CHARS):
+            return chunk
+        text, self._carry = _normalize_chunk(self._carry + chunk)
+        return text
+
+    def flush(self) -> str:
+        """
+        Returns whatever is still held back. Call once the stream has ended.
+        """
+        text, self._carry = self._carry, ""
+        return normalize_text(text)